@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import Iterable
+from functools import lru_cache
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Iterable
+import asyncio
+import html
+import io
 import json
 import re
+import sys
 from urllib.parse import parse_qs, urljoin, urlparse
 
+import aiohttp
 import feedparser
 from dateutil import parser as date_parser
 from dateutil import tz
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve as sv
+from selectolax.lexbor import LexborHTMLParser
 
 
 @dataclass(frozen=True)
@@ -22,7 +33,7 @@ class Source:
     tags: list[str] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     source: str
     title: str
@@ -31,41 +42,55 @@ class Item:
     summary: str | None = None
 
 
-_HTML_TAG_RE = re.compile(r"<[^>]+>")
+@dataclass
+class FeedCacheEntry:
+    etag: str | None = None
+    modified: str | None = None
+    items: list[Item] = field(default_factory=list)
+
+
+_UTC = tz.UTC
+_SIMPLE_SELECTOR_RE = re.compile(r"^([A-Za-z][\w-]*)(?:[.#][\w-]+|\[[^\]]*\])*$")
+
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "llm-vendor-daily/0.1"})
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
 
 
 def _strip_html(text: str) -> str:
-    return _HTML_TAG_RE.sub("", text).replace("\n", " ").strip()
+    if "<" not in text:
+        # The parser decodes entities, so the fast path has to as well.
+        return " ".join(html.unescape(text).split()) if "&" in text else " ".join(text.split())
+    return " ".join(LexborHTMLParser(text).text(separator="").split())
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(value: str) -> datetime | None:
+    try:
+        dt = date_parser.parse(value)
+    except (ValueError, TypeError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=_UTC)
+    return dt
 
 
 def _parse_published(entry: dict, local_tz: tz.tzfile | tz.tzlocal | None) -> datetime | None:
     for key in ("published", "updated", "created"):
-        value = entry.get(key)
-        if value:
-            try:
-                dt = date_parser.parse(value)
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=tz.UTC)
-                if local_tz:
-                    dt = dt.astimezone(local_tz)
-                return dt
-            except (ValueError, TypeError):
-                continue
+        dt = _parse_date_value(entry.get(key), local_tz)
+        if dt:
+            return dt
     return None
 
 
 def _parse_date_value(value: str | None, local_tz: tz.tzfile | tz.tzlocal | None) -> datetime | None:
-    if not value:
-        return None
-    try:
-        dt = date_parser.parse(value)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=tz.UTC)
-        if local_tz:
-            dt = dt.astimezone(local_tz)
-        return dt
-    except (ValueError, TypeError):
+    if not value or not isinstance(value, str):
         return None
+    dt = _parse_date_cached(value)
+    if dt and local_tz:
+        dt = dt.astimezone(local_tz)
+    return dt
 
 
 def _is_rsshub_transform(url: str) -> bool:
@@ -80,11 +105,19 @@ def _rsshub_params(url: str) -> tuple[str | None, dict[str, str]]:
     return target, params
 
 
-def _select_first_text(node, selectors: str | None) -> str | None:
+def _compile_selector(selector: str | None) -> sv.SoupSieve | None:
+    return sv.compile(selector) if selector else None
+
+
+def _compile_selector_list(selectors: str | None) -> tuple[sv.SoupSieve, ...]:
     if not selectors:
-        return None
-    for selector in [s.strip() for s in selectors.split(",") if s.strip()]:
-        found = node.select_one(selector)
+        return ()
+    return tuple(sv.compile(s.strip()) for s in selectors.split(",") if s.strip())
+
+
+def _select_first_text(node, selectors: tuple[sv.SoupSieve, ...]) -> str | None:
+    for selector in selectors:
+        found = selector.select_one(node)
         if found:
             text = found.get_text(" ", strip=True)
             if text:
@@ -92,37 +125,46 @@ def _select_first_text(node, selectors: str | None) -> str | None:
     return None
 
 
-def _select_first_node(node, selector: str | None):
-    if not selector:
+def _select_first_node(node, selector: sv.SoupSieve | None):
+    if selector is None:
+        return None
+    return selector.select_one(node)
+
+
+def _item_strainer(item_selector: str | None) -> SoupStrainer | None:
+    if not item_selector:
+        return None
+    match = _SIMPLE_SELECTOR_RE.match(item_selector.strip())
+    if not match:
         return None
-    return node.select_one(selector)
+    return SoupStrainer(match.group(1))
 
 
 def _parse_rsshub_html(
     source: Source, local_tz: tz.tzfile | tz.tzlocal | None, target_url: str, params: dict[str, str]
 ) -> list[Item]:
-    resp = requests.get(target_url, headers={"User-Agent": "llm-vendor-daily/0.1"}, timeout=30)
+    resp = _SESSION.get(target_url, timeout=30)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-
     item_selector = params.get("item")
+    soup = BeautifulSoup(resp.content, "lxml", parse_only=_item_strainer(item_selector))
+
     items = soup.select(item_selector) if item_selector else []
-    title_selector = params.get("itemTitle")
-    link_selector = params.get("itemLink")
+    title_selectors = _compile_selector_list(params.get("itemTitle"))
+    link_selector = _compile_selector(params.get("itemLink"))
     link_attr = params.get("itemLinkAttr", "href")
     link_prefix = params.get("itemLinkPrefix")
-    date_selector = params.get("itemPubDate")
+    date_selector = _compile_selector(params.get("itemPubDate"))
     date_attr = params.get("itemPubDateAttr")
-    desc_selector = params.get("itemDesc")
+    desc_selector = _compile_selector(params.get("itemDesc"))
     desc_attr = params.get("itemDescAttr")
 
     results: list[Item] = []
     for node in items:
-        title = _select_first_text(node, title_selector)
+        title = _select_first_text(node, title_selectors)
         if not title:
             continue
 
-        link_node = _select_first_node(node, link_selector) if link_selector else None
+        link_node = _select_first_node(node, link_selector)
         if link_node is None and getattr(node, "name", None) == "a":
             link_node = node
         link = link_node.get(link_attr) if link_node else None
@@ -131,7 +173,7 @@ def _parse_rsshub_html(
         if link_prefix and not link.startswith("http"):
             link = urljoin(link_prefix, link)
 
-        date_node = _select_first_node(node, date_selector) if date_selector else None
+        date_node = _select_first_node(node, date_selector)
         if date_node is None:
             date_node = node.find("time")
         date_value = None
@@ -146,7 +188,7 @@ def _parse_rsshub_html(
         if not published:
             continue
 
-        desc_node = _select_first_node(node, desc_selector) if desc_selector else None
+        desc_node = _select_first_node(node, desc_selector)
         summary = None
         if desc_node is not None:
             if desc_attr:
@@ -167,11 +209,16 @@ def _parse_rsshub_html(
     return results
 
 
-def _get_json_path(data: dict, path: str | None):
+@lru_cache(maxsize=256)
+def _split_path(path: str) -> tuple[str, ...]:
+    return tuple(path.split("."))
+
+
+def _get_json_path(data: dict, path: str | None) -> Any:
     if not path:
         return None
-    current = data
-    for part in path.split("."):
+    current: Any = data
+    for part in _split_path(path):
         if isinstance(current, dict):
             current = current.get(part)
         else:
@@ -182,7 +229,7 @@ def _get_json_path(data: dict, path: str | None):
 def _parse_rsshub_json(
     source: Source, local_tz: tz.tzfile | tz.tzlocal | None, target_url: str, params: dict[str, str]
 ) -> list[Item]:
-    resp = requests.get(target_url, headers={"User-Agent": "llm-vendor-daily/0.1"}, timeout=30)
+    resp = _SESSION.get(target_url, timeout=30)
     resp.raise_for_status()
     data = resp.json()
 
@@ -224,24 +271,28 @@ def _parse_rsshub_json(
     return results
 
 
-def _fetch_rsshub_fallback(source: Source, local_tz: tz.tzfile | tz.tzlocal | None) -> list[Item]:
+def _fetch_rsshub_transform(source: Source, local_tz: tz.tzfile | tz.tzlocal | None) -> list[Item]:
     target_url, params = _rsshub_params(source.rss)
     if not target_url:
         return []
-    if "/transform/html" in source.rss:
-        return _parse_rsshub_html(source, local_tz, target_url, params)
-    if "/transform/json" in source.rss:
-        return _parse_rsshub_json(source, local_tz, target_url, params)
+    try:
+        if "/transform/html" in source.rss:
+            return _parse_rsshub_html(source, local_tz, target_url, params)
+        if "/transform/json" in source.rss:
+            return _parse_rsshub_json(source, local_tz, target_url, params)
+    except Exception as exc:
+        # The RSSHub instance may accept selectors or pages the local parser rejects.
+        error = str(exc) or type(exc).__name__
+        print(f"Local transform failed for {source.name}, trying RSSHub: {error}", file=sys.stderr)
+        return []
     return []
 
 
-def fetch_feed(source: Source, local_tz: tz.tzfile | tz.tzlocal | None) -> list[Item]:
-    feed = feedparser.parse(
-        source.rss,
-        request_headers={"User-Agent": "llm-vendor-daily/0.1"},
-    )
+def _items_from_entries(
+    source: Source, entries: list, local_tz: tz.tzfile | tz.tzlocal | None
+) -> list[Item]:
     items: list[Item] = []
-    for entry in feed.entries:
+    for entry in entries:
         published = _parse_published(entry, local_tz)
         if not published:
             continue
@@ -260,29 +311,137 @@ def fetch_feed(source: Source, local_tz: tz.tzfile | tz.tzlocal | None) -> list[
                 summary=summary,
             )
         )
-    if items:
-        return items
-    if _is_rsshub_transform(source.rss):
-        try:
-            return _fetch_rsshub_fallback(source, local_tz)
-        except requests.RequestException:
+    return items
+
+
+def _parse_feed_content(
+    source: Source,
+    content: bytes,
+    response_headers: dict[str, str],
+    local_tz: tz.tzfile | tz.tzlocal | None,
+) -> list[Item]:
+    # Wrap the body so feedparser never treats it as a local path or URL to open.
+    feed = feedparser.parse(io.BytesIO(content), response_headers=response_headers)
+    return _items_from_entries(source, feed.entries, local_tz)
+
+
+async def fetch_feed_async(
+    session: aiohttp.ClientSession,
+    source: Source,
+    local_tz: tz.tzfile | tz.tzlocal | None,
+    cache: dict[str, FeedCacheEntry] | None = None,
+) -> list[Item]:
+    # Run RSSHub transforms locally first; the RSSHub instance itself is only a backup.
+    is_transform = _is_rsshub_transform(source.rss)
+    if is_transform:
+        items = await asyncio.to_thread(_fetch_rsshub_transform, source, local_tz)
+        if items:
+            if cache is not None:
+                cache.pop(source.rss, None)
+            return items
+
+    cached = cache.get(source.rss) if cache is not None else None
+    request_headers: dict[str, str] = {}
+    if cached and cached.etag:
+        request_headers["If-None-Match"] = cached.etag
+    if cached and cached.modified:
+        request_headers["If-Modified-Since"] = cached.modified
+    try:
+        async with session.get(
+            source.rss, headers=request_headers, timeout=aiohttp.ClientTimeout(total=30)
+        ) as resp:
+            status = resp.status
+            if status == 304 and cached:
+                return [
+                    replace(
+                        item,
+                        source=source.name,
+                        published=item.published.astimezone(local_tz) if local_tz else item.published,
+                    )
+                    for item in cached.items
+                ]
+            content = await resp.read()
+            headers = {key.lower(): value for key, value in resp.headers.items()}
+            headers.setdefault("content-location", str(resp.url))
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        if is_transform:
             return []
+        raise
+    items = await asyncio.to_thread(_parse_feed_content, source, content, headers, local_tz)
+
+    if cache is not None:
+        etag = headers.get("etag")
+        modified = headers.get("last-modified")
+        if status == 200 and (etag or modified):
+            cache[source.rss] = FeedCacheEntry(etag=etag, modified=modified, items=items)
+        else:
+            cache.pop(source.rss, None)
     return items
 
 
-def dedupe_items(items: Iterable[Item]) -> list[Item]:
-    seen: set[str] = set()
-    deduped: list[Item] = []
+def load_feed_cache(path: Path) -> dict[str, FeedCacheEntry]:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    cache: dict[str, FeedCacheEntry] = {}
+    for url, raw in data.items():
+        if not isinstance(raw, dict):
+            continue
+        items: list[Item] = []
+        for raw_item in raw.get("items") or []:
+            try:
+                items.append(
+                    Item(
+                        source=raw_item["source"],
+                        title=raw_item["title"],
+                        link=raw_item["link"],
+                        published=datetime.fromisoformat(raw_item["published"]),
+                        summary=raw_item.get("summary"),
+                    )
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+        cache[url] = FeedCacheEntry(etag=raw.get("etag"), modified=raw.get("modified"), items=items)
+    return cache
+
+
+def save_feed_cache(path: Path, cache: dict[str, FeedCacheEntry]) -> None:
+    data = {
+        url: {
+            "etag": entry.etag,
+            "modified": entry.modified,
+            "items": [
+                {
+                    "source": item.source,
+                    "title": item.title,
+                    "link": item.link,
+                    "published": item.published.isoformat(),
+                    "summary": item.summary,
+                }
+                for item in entry.items
+            ],
+        }
+        for url, entry in sorted(cache.items())
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def dedupe_and_filter(items: Iterable[Item], target_date) -> list[Item]:
+    seen: set[tuple[str, str]] = set()
+    filtered: list[Item] = []
     for item in items:
-        key = f"{item.link}::{item.title}"
+        key = (item.link, item.title)
         if key in seen:
             continue
         seen.add(key)
-        deduped.append(item)
-    return deduped
-
-
-def filter_items_by_date(items: Iterable[Item], target_date) -> list[Item]:
-    filtered = [item for item in items if item.published.date() == target_date]
-    filtered.sort(key=lambda i: i.published)
+        if item.published.date() == target_date:
+            filtered.append(item)
+    filtered.sort(key=attrgetter("published"))
     return filtered
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+import json
+import time
+
+
+def cache_key(model: str, messages: list[dict], temperature: float) -> str | None:
+    # Sampled completions differ between calls, so only deterministic requests are cacheable.
+    if temperature > 0:
+        return None
+    raw = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FileCacheBackend:
+    root: Path
+    ttl_seconds: float = 7 * 24 * 60 * 60
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _expired(self, path: Path, now: float) -> bool:
+        return now - path.stat().st_mtime > self.ttl_seconds
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            if self._expired(path, time.time()):
+                path.unlink(missing_ok=True)
+                return None
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        content = data.get("content") if isinstance(data, dict) else None
+        return content if isinstance(content, str) else None
+
+    def set(self, key: str, content: str) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._path(key).write_text(json.dumps({"content": content}, ensure_ascii=False), encoding="utf-8")
+
+    def prune(self) -> None:
+        # Prompts change every day, so stale entries are rarely read again and must be swept.
+        now = time.time()
+        try:
+            paths = list(self.root.glob("*.json"))
+        except OSError:
+            return
+        for path in paths:
+            try:
+                if self._expired(path, now):
+                    path.unlink(missing_ok=True)
+            except OSError:
+                continue
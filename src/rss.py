@@ -2,19 +2,31 @@ from __future__ import annotations
 
 from datetime import datetime
 from email.utils import format_datetime
+from functools import lru_cache
 from html import escape
+from io import StringIO
 from typing import Iterable
-import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape as xml_escape
 
 from dateutil import tz
 
 from .fetch import Item
 
+_UTC = tz.UTC
+_ATTR_ENTITIES = {'"': "&quot;", "\r": "&#13;", "\n": "&#10;", "\t": "&#09;"}
 
+
+@lru_cache(maxsize=1024)
 def _rfc822(dt: datetime) -> str:
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=tz.UTC)
-    return format_datetime(dt.astimezone(tz.UTC))
+        dt = dt.replace(tzinfo=_UTC)
+    return format_datetime(dt.astimezone(_UTC))
+
+
+def _text_element(tag: str, text: str | None) -> str:
+    if not text:
+        return f"<{tag} />"
+    return f"<{tag}>{xml_escape(text)}</{tag}>"
 
 
 def build_rss(
@@ -25,26 +37,27 @@ def build_rss(
     channel_description: str,
     feed_link: str | None = None,
 ) -> str:
-    rss = ET.Element("rss", version="2.0", attrib={"xmlns:atom": "http://www.w3.org/2005/Atom"})
-    channel = ET.SubElement(rss, "channel")
-    ET.SubElement(channel, "title").text = channel_title
-    ET.SubElement(channel, "link").text = channel_link
-    ET.SubElement(channel, "description").text = channel_description
+    buf = StringIO()
+    write = buf.write
+    write("<?xml version='1.0' encoding='utf-8'?>\n")
+    write('<rss xmlns:atom="http://www.w3.org/2005/Atom" version="2.0"><channel>')
+    write(_text_element("title", channel_title))
+    write(_text_element("link", channel_link))
+    write(_text_element("description", channel_description))
 
     if feed_link:
-        atom_link = ET.SubElement(channel, "atom:link")
-        atom_link.set("href", feed_link)
-        atom_link.set("rel", "self")
-        atom_link.set("type", "application/rss+xml")
+        href = xml_escape(feed_link, _ATTR_ENTITIES)
+        write(f'<atom:link href="{href}" rel="self" type="application/rss+xml" />')
 
     for item in items:
-        node = ET.SubElement(channel, "item")
-        ET.SubElement(node, "title").text = item.title
-        ET.SubElement(node, "link").text = item.link
-        ET.SubElement(node, "guid").text = item.link
-        ET.SubElement(node, "pubDate").text = _rfc822(item.published)
+        link = xml_escape(item.link)
+        write("<item>")
+        write(_text_element("title", item.title))
+        write(f"<link>{link}</link><guid>{link}</guid>" if link else "<link /><guid />")
+        write(_text_element("pubDate", _rfc822(item.published)))
         if item.summary:
-            ET.SubElement(node, "description").text = escape(item.summary)
+            write(_text_element("description", escape(item.summary)))
+        write("</item>")
 
-    xml = ET.tostring(rss, encoding="utf-8", xml_declaration=True)
-    return xml.decode("utf-8") + "\n"
+    write("</channel></rss>\n")
+    return buf.getvalue()
@@ -1,22 +1,39 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
+from functools import lru_cache
 from pathlib import Path
+import heapq
 import os
 import re
 import subprocess
 import sys
 
+import aiohttp
 import yaml
 from dateutil import tz
 
-from .fetch import Item, Source, dedupe_items, fetch_feed, filter_items_by_date
+from .fetch import (
+    FeedCacheEntry,
+    Item,
+    Source,
+    dedupe_and_filter,
+    fetch_feed_async,
+    load_feed_cache,
+    save_feed_cache,
+)
 from .rss import build_rss
 from .summarize import summarize_items
 
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 _DAILY_REPORT_RE = re.compile(r"^\d{4}-\d{2}-\d{2}\.md$")
+_MATCH_REPORT = _DAILY_REPORT_RE.match
+_FEED_SUMMARY_LIMIT = 12000
+_REPORT_READ_CHARS = 16000
 
 
 @dataclass
@@ -95,18 +112,33 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
         default=int(os.getenv("DAILY_FEED_LIMIT", "60")),
         help="Maximum number of daily digest entries included in feed.xml.",
     )
+    parser.add_argument(
+        "--feed-cache",
+        default=os.getenv("FEED_CACHE_PATH", str(_repo_root() / "data" / ".feed_cache.json")),
+        help="JSON file storing ETag/Last-Modified validators per feed. Pass an empty value to disable.",
+    )
     return parser.parse_args(argv)
 
 
+@lru_cache(maxsize=None)
+def _get_tz(name: str):
+    return tz.gettz(name)
+
+
 def _resolve_timezone(name: str | None):
     if name:
-        resolved = tz.gettz(name)
+        resolved = _get_tz(name)
         if resolved is not None:
             return resolved
         print(f"Unknown timezone '{name}', falling back to system local time.", file=sys.stderr)
     return tz.tzlocal()
 
 
+def _parse_iso_date(value: str) -> date:
+    # Callers validate the YYYY-MM-DD shape first; date() still rejects impossible days.
+    return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+
 def _resolve_repo_slug() -> str:
     repo = (os.getenv("GITHUB_REPOSITORY") or "").strip()
     if repo:
@@ -157,27 +189,33 @@ def _build_daily_feed_items(
     if not output_dir.exists():
         return []
 
-    report_paths = [
-        path
-        for path in output_dir.iterdir()
-        if path.is_file() and _DAILY_REPORT_RE.match(path.name)
-    ]
-    report_paths.sort(key=lambda p: p.name, reverse=True)
+    # YYYY-MM-DD names sort chronologically, so the newest reports are the largest names.
+    with os.scandir(output_dir) as entries:
+        report_names = heapq.nlargest(
+            limit,
+            (
+                entry.name
+                for entry in entries
+                if entry.is_file() and _MATCH_REPORT(entry.name)
+            ),
+        )
 
     items: list[Item] = []
-    for path in report_paths[:limit]:
+    for name in report_names:
         try:
-            report_date = datetime.strptime(path.stem, "%Y-%m-%d").date()
+            report_date = _parse_iso_date(name)
         except ValueError:
             continue
 
         link = (
-            f"https://github.com/{repo_slug}/blob/master/data/daily/{path.name}"
+            f"https://github.com/{repo_slug}/blob/master/data/daily/{name}"
             if repo_slug
             else "https://github.com/"
         )
-        body = _strip_report_header(path.read_text(encoding="utf-8"))
-        summary = _truncate(body, 12000) if body else "No digest content."
+        # Only the head of each report can survive truncation, so skip reading the rest.
+        with open(output_dir / name, "r", encoding="utf-8") as handle:
+            body = _strip_report_header(handle.read(_REPORT_READ_CHARS))
+        summary = _truncate(body, _FEED_SUMMARY_LIMIT) if body else "No digest content."
         published = datetime.combine(report_date, time(hour=12))
         if local_tz:
             published = published.replace(tzinfo=local_tz)
@@ -194,6 +232,26 @@ def _build_daily_feed_items(
     return items
 
 
+async def _fetch_all(
+    sources: list[Source],
+    local_tz: tz.tzfile | tz.tzlocal | None,
+    cache: dict[str, FeedCacheEntry] | None = None,
+) -> list[list[Item] | BaseException]:
+    # Feed parsing and RSSHub transforms run in worker threads; size the pool so every
+    # source gets one instead of the CPU-based default.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max(1, min(32, len(sources))))
+    )
+    async with aiohttp.ClientSession(
+        headers={"User-Agent": "llm-vendor-daily/0.1"},
+        connector=aiohttp.TCPConnector(limit=64, limit_per_host=4),
+    ) as session:
+        return await asyncio.gather(
+            *(fetch_feed_async(session, source, local_tz, cache) for source in sources),
+            return_exceptions=True,
+        )
+
+
 def _print_source_health(rows: list[SourceHealth], report_date: date, stale_days: int) -> None:
     stale_days = max(stale_days, 0)
     print(f"Source health for {report_date.isoformat()} (stale > {stale_days} days):")
@@ -243,7 +301,9 @@ def main(argv: list[str]) -> int:
 
     if args.date:
         try:
-            report_date = datetime.strptime(args.date, "%Y-%m-%d").date()
+            if not _ISO_DATE_RE.match(args.date):
+                raise ValueError(args.date)
+            report_date = _parse_iso_date(args.date)
         except ValueError:
             print("Invalid --date format, expected YYYY-MM-DD", file=sys.stderr)
             return 2
@@ -257,36 +317,49 @@ def main(argv: list[str]) -> int:
 
     all_items: list[Item] = []
     health_rows: list[SourceHealth] = []
-    for source in sources:
-        try:
-            source_items = fetch_feed(source, local_tz)
-            all_items.extend(source_items)
-            latest = max((item.published.date() for item in source_items), default=None)
-            items_on_report_date = sum(1 for item in source_items if item.published.date() == report_date)
-            health_rows.append(
-                SourceHealth(
-                    name=source.name,
-                    total_items=len(source_items),
-                    items_on_report_date=items_on_report_date,
-                    latest_date=latest,
-                )
-            )
-        except Exception as exc:
-            print(f"Failed to fetch {source.name}: {exc}", file=sys.stderr)
+    feed_cache_path = Path(args.feed_cache) if args.feed_cache else None
+    feed_cache = load_feed_cache(feed_cache_path) if feed_cache_path else None
+    results = asyncio.run(_fetch_all(sources, local_tz, feed_cache))
+    if feed_cache_path and feed_cache is not None:
+        # Drop feeds that were removed from the config so the committed cache does not keep growing.
+        configured = {source.rss for source in sources}
+        save_feed_cache(
+            feed_cache_path, {url: entry for url, entry in feed_cache.items() if url in configured}
+        )
+    for source, result in zip(sources, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            error = str(result) or type(result).__name__
+            print(f"Failed to fetch {source.name}: {error}", file=sys.stderr)
             health_rows.append(
                 SourceHealth(
                     name=source.name,
                     total_items=0,
                     items_on_report_date=0,
                     latest_date=None,
-                    error=str(exc),
+                    error=error,
                 )
             )
+            continue
+
+        source_items = result
+        all_items.extend(source_items)
+        published_dates = [item.published.date() for item in source_items]
+        latest = max(published_dates, default=None)
+        items_on_report_date = published_dates.count(report_date)
+        health_rows.append(
+            SourceHealth(
+                name=source.name,
+                total_items=len(source_items),
+                items_on_report_date=items_on_report_date,
+                latest_date=latest,
+            )
+        )
 
     _print_source_health(health_rows, report_date, args.stale_days)
 
-    deduped_items = dedupe_items(all_items)
-    items = filter_items_by_date(deduped_items, report_date)
+    items = dedupe_and_filter(all_items, report_date)
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -1,69 +1,156 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+from io import StringIO
+from itertools import groupby
+from operator import attrgetter
+from pathlib import Path
+import asyncio
+import gzip
 import os
 import sys
-from typing import Iterable
+from typing import TYPE_CHECKING, Any, Iterable
 
-import requests
+import orjson
 
-from .fetch import Item
+from .llm_cache import FileCacheBackend, cache_key
+
+if TYPE_CHECKING:
+    import httpx
+
+    from .fetch import Item
+
+_TEMPERATURE = 0
+_ELLIPSIS = "..."
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRIES = 3
+_BACKOFF_SECONDS = 0.5
+_BATCH_ENDPOINT = "/v1/chat/completions"
+_BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / ".cache" / "llm"
+_SOURCE_KEY = attrgetter("source")
+_ENGLISH_HEADER = "## English"
+_CHINESE_HEADER = "## 中文"
+_MD_TEXT_ESCAPE = str.maketrans({"\\": "\\\\", "[": "\\[", "]": "\\]", "\n": " "})
+_MD_LINK_ESCAPE = str.maketrans({"(": "%28", ")": "%29", " ": "%20", "\n": ""})
+_ENTRY_TEMPLATE = "\n- [{title}]({link}) ({date}){summary}".format
 
 
 def _truncate(text: str, limit: int = 240) -> str:
     if len(text) <= limit:
         return text
-    return text[: limit - 3].rstrip() + "..."
+    cut = text[: limit - 3]
+    if cut and not cut[-1].isspace():
+        return cut + _ELLIPSIS
+    return cut.rstrip() + _ELLIPSIS
 
 
-def _group_items(items: Iterable[Item]):
-    grouped = defaultdict(list)
-    for item in items:
-        grouped[item.source].append(item)
-    return grouped
+def _group_items(items: Iterable[Item]) -> list[tuple[str, list[Item]]]:
+    # The sort is stable, so items keep their incoming order within each source.
+    ordered = sorted(items, key=_SOURCE_KEY)
+    return [(source, list(group)) for source, group in groupby(ordered, key=_SOURCE_KEY)]
 
 
-def _format_date(dt: datetime) -> str:
+@lru_cache(maxsize=1024)
+def _format_wall_time(dt: datetime, utcoffset: timedelta | None) -> str:
     return dt.strftime("%Y-%m-%d %H:%M")
 
 
+def _format_date(dt: datetime) -> str:
+    # Aware datetimes compare equal across zones, so the offset is part of the cache key.
+    return _format_wall_time(dt, dt.utcoffset())
+
+
+def _fallback_section(source: str, items: list[Item]) -> str:
+    buf = StringIO()
+    write = buf.write
+    render = _ENTRY_TEMPLATE
+    trunc = _truncate
+    fmt = _format_date
+    write(f"### {source}")
+    for item in items:
+        title, link, published, summary = item.title, item.link, item.published, item.summary
+        write(
+            render(
+                title=title.translate(_MD_TEXT_ESCAPE),
+                link=link.translate(_MD_LINK_ESCAPE),
+                date=fmt(published),
+                summary=f" - {trunc(summary).translate(_MD_TEXT_ESCAPE)}" if summary else "",
+            )
+        )
+    return buf.getvalue()
+
+
 def _fallback_digest(items: list[Item]) -> str:
     grouped = _group_items(items)
-    lines: list[str] = []
-    lines.append("## English")
-    for source in sorted(grouped.keys()):
-        lines.append(f"### {source}")
-        for item in grouped[source]:
-            summary = f" - {_truncate(item.summary)}" if item.summary else ""
-            entry = f"[{item.title}]({item.link}) ({_format_date(item.published)}){summary}"
-            lines.append(f"- {entry}")
-        lines.append("")
-    lines.append("## 中文")
-    for source in sorted(grouped.keys()):
-        lines.append(f"### {source}")
-        for item in grouped[source]:
-            summary = f" - {_truncate(item.summary)}" if item.summary else ""
-            entry = f"[{item.title}]({item.link}) ({_format_date(item.published)}){summary}"
-            lines.append(f"- {entry}")
-        lines.append("")
-    return "\n".join(lines).rstrip() + "\n"
-
-
-def _openai_chat(messages: list[dict], model: str, api_base: str, api_key: str) -> str:
+    # Both language sections list the same entries, so render them once and reuse the text.
+    sections = "".join(
+        f"{_fallback_section(source, source_items)}\n\n" for source, source_items in grouped
+    )
+    return f"{_ENGLISH_HEADER}\n{sections}{_CHINESE_HEADER}\n{sections}".rstrip() + "\n"
+
+
+def _split_sections(content: str) -> tuple[str, str] | None:
+    english_at = content.find(_ENGLISH_HEADER)
+    chinese_at = content.find(_CHINESE_HEADER)
+    if english_at < 0 or chinese_at < english_at:
+        return None
+    english = content[english_at + len(_ENGLISH_HEADER) : chinese_at].strip()
+    chinese = content[chinese_at + len(_CHINESE_HEADER) :].strip()
+    if not english or not chinese:
+        return None
+    return english, chinese
+
+
+async def _openai_chat(
+    client: httpx.AsyncClient,
+    messages: list[dict],
+    model: str,
+    api_base: str,
+    api_key: str,
+    cache: FileCacheBackend | None = None,
+) -> str:
+    key = cache_key(model, messages, _TEMPERATURE) if cache else None
+    if cache and key:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     url = api_base.rstrip("/") + "/chat/completions"
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     payload = {
         "model": model,
         "messages": messages,
-        "temperature": 0.2,
+        "temperature": _TEMPERATURE,
     }
-    resp = requests.post(url, headers=headers, json=payload, timeout=60)
-    resp.raise_for_status()
-    data = resp.json()
-    return data["choices"][0]["message"]["content"].strip()
+    body = orjson.dumps(payload)
+    if os.getenv("LLM_GZIP_REQUESTS") == "1":
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    for attempt in range(_MAX_RETRIES + 1):
+        resp = await client.post(url, headers=headers, content=body)
+        if resp.status_code not in _RETRY_STATUSES or attempt == _MAX_RETRIES:
+            resp.raise_for_status()
+            break
+        await asyncio.sleep(_BACKOFF_SECONDS * 2**attempt)
+    try:
+        data = orjson.loads(resp.content)
+        content = data["choices"][0]["message"]["content"].strip()
+    except (ValueError, KeyError, IndexError, TypeError) as exc:
+        raise ValueError(f"unexpected chat completion response: {exc!r}") from exc
+    # Unusable replies would otherwise be served from the cache until they expire.
+    if cache and key and _split_sections(content) is not None:
+        cache.set(key, content)
+    return content
+
+
+def _resolve_cache() -> FileCacheBackend | None:
+    cache_dir = os.getenv("LLM_CACHE_DIR", str(_DEFAULT_CACHE_DIR)).strip()
+    return FileCacheBackend(Path(cache_dir)) if cache_dir else None
 
 
+@lru_cache(maxsize=None)
 def _resolve_chat_config() -> tuple[str | None, str, str]:
     zhipu_key = os.getenv("ZHIPU_API_KEY")
     if zhipu_key:
@@ -77,43 +164,247 @@ def _resolve_chat_config() -> tuple[str | None, str, str]:
     return api_key, api_base, model
 
 
-def summarize_items(items: list[Item], report_date: str) -> str:
-    api_key, api_base, model = _resolve_chat_config()
-
-    if not api_key:
-        return _fallback_digest(items)
-
-    grouped = _group_items(items)
-    bullets: list[str] = []
-    for source in sorted(grouped.keys()):
-        for item in grouped[source]:
-            bullets.append(
-                f"[{source}] {item.title} | {item.link} | {item.summary or ''}"
-            )
-
+def _source_messages(source: str, bullets: list[str], report_date: str) -> list[dict]:
     system = (
         "You are an assistant that writes concise daily vendor digests. "
         "Return markdown with two top-level sections: '## English' and '## 中文'. "
-        "Within each section, group by vendor using '### Vendor'. "
+        "Within each section, put the items under a '### Vendor' heading for the given vendor. "
         "Each item should be a single bullet with 1-2 sentences, always include the source link."
     )
     user = (
-        f"Write a bilingual daily digest for {report_date}.\n"
+        f"Write a bilingual daily digest of {source} for {report_date}.\n"
         "Items:\n" + "\n".join(bullets)
     )
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
 
-    try:
-        content = _openai_chat(
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
+
+async def _summarize_source(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    messages: list[dict],
+    model: str,
+    api_base: str,
+    api_key: str,
+    cache: FileCacheBackend | None,
+) -> str:
+    async with semaphore:
+        return await _openai_chat(
+            client,
+            messages=messages,
             model=model,
             api_base=api_base,
             api_key=api_key,
+            cache=cache,
         )
-    except requests.RequestException as exc:
-        print(f"AI summary failed, falling back to extractive list: {exc}", file=sys.stderr)
+
+
+async def _api_json(
+    client: httpx.AsyncClient, method: str, url: str, api_key: str, **kwargs: Any
+) -> dict:
+    resp = await client.request(method, url, headers={"Authorization": f"Bearer {api_key}"}, **kwargs)
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
+
+async def _openai_batch(
+    client: httpx.AsyncClient,
+    batch_messages: dict[str, list[dict]],
+    model: str,
+    api_base: str,
+    api_key: str,
+    cache: FileCacheBackend | None,
+) -> dict[str, str]:
+    completed: dict[str, str] = {}
+    keys: dict[str, str | None] = {}
+    lines: list[bytes] = []
+    for custom_id, messages in batch_messages.items():
+        key = cache_key(model, messages, _TEMPERATURE) if cache else None
+        cached = cache.get(key) if cache and key else None
+        if cached is not None:
+            completed[custom_id] = cached
+            continue
+        keys[custom_id] = key
+        lines.append(
+            orjson.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": _BATCH_ENDPOINT,
+                    "body": {"model": model, "messages": messages, "temperature": _TEMPERATURE},
+                }
+            )
+        )
+    if not lines:
+        return completed
+
+    base = api_base.rstrip("/")
+    uploaded = await _api_json(
+        client,
+        "POST",
+        f"{base}/files",
+        api_key,
+        data={"purpose": "batch"},
+        files={"file": ("digest.jsonl", b"\n".join(lines), "application/jsonl")},
+    )
+    batch = await _api_json(
+        client,
+        "POST",
+        f"{base}/batches",
+        api_key,
+        json={
+            "input_file_id": uploaded["id"],
+            "endpoint": _BATCH_ENDPOINT,
+            "completion_window": "24h",
+        },
+    )
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + float(os.getenv("OPENAI_BATCH_TIMEOUT", "3600"))
+    delay = 5.0
+    while batch.get("status") not in _BATCH_FINAL_STATUSES:
+        if loop.time() + delay > deadline:
+            print(f"OpenAI batch {batch['id']} did not finish in time, cancelling.", file=sys.stderr)
+            await _api_json(client, "POST", f"{base}/batches/{batch['id']}/cancel", api_key)
+            return completed
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 60.0)
+        batch = await _api_json(client, "GET", f"{base}/batches/{batch['id']}", api_key)
+
+    output_file_id = batch.get("output_file_id")
+    if batch["status"] != "completed" or not output_file_id:
+        print(f"OpenAI batch {batch['id']} ended with status {batch['status']}.", file=sys.stderr)
+        return completed
+
+    resp = await client.get(
+        f"{base}/files/{output_file_id}/content",
+        headers={"Authorization": f"Bearer {api_key}"},
+    )
+    resp.raise_for_status()
+
+    for line in resp.content.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue
+        if not isinstance(record, dict):
+            continue
+        record_id = record.get("custom_id")
+        response = record.get("response") or {}
+        if record_id not in keys or response.get("status_code") != 200:
+            continue
+        try:
+            content = response["body"]["choices"][0]["message"]["content"].strip()
+        except (KeyError, IndexError, TypeError):
+            continue
+        completed[record_id] = content
+        key = keys[record_id]
+        if cache and key and _split_sections(content) is not None:
+            cache.set(key, content)
+    return completed
+
+
+async def _summarize_items_async(items: list[Item], report_date: str) -> str:
+    api_key, api_base, model = _resolve_chat_config()
+
+    if not api_key:
         return _fallback_digest(items)
 
-    return content.rstrip() + "\n"
+    # Deferred so runs without an API key, and imports of the helpers, skip loading httpx/h2.
+    import httpx
+
+    grouped = _group_items(items)
+    sources = [source for source, _ in grouped]
+    per_source_bullets: dict[str, list[str]] = {}
+    for source, source_items in grouped:
+        per_source_bullets[source] = [
+            f"[{source}] {item.title} | {item.link} | {item.summary or ''}"
+            for item in source_items
+        ]
+    per_source_messages = {
+        source: _source_messages(source, per_source_bullets[source], report_date) for source in sources
+    }
+
+    cache = _resolve_cache()
+    if cache:
+        cache.prune()
+    semaphore = asyncio.Semaphore(max(int(os.getenv("LLM_MAX_CONCURRENCY", "4")), 1))
+    results: dict[str, str | BaseException] = {}
+    # HTTP/2 multiplexes the concurrent per-vendor requests over a single connection.
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    )
+    async with httpx.AsyncClient(transport=transport, timeout=60) as client:
+        if os.getenv("USE_OPENAI_BATCH") == "1":
+            try:
+                results.update(
+                    await _openai_batch(
+                        client,
+                        per_source_messages,
+                        model=model,
+                        api_base=api_base,
+                        api_key=api_key,
+                        cache=cache,
+                    )
+                )
+            except (httpx.HTTPError, KeyError, ValueError) as exc:
+                print(f"AI batch failed, sending requests individually: {exc}", file=sys.stderr)
+
+        pending = [source for source in sources if source not in results]
+        responses = await asyncio.gather(
+            *(
+                _summarize_source(
+                    client,
+                    semaphore,
+                    per_source_messages[source],
+                    model=model,
+                    api_base=api_base,
+                    api_key=api_key,
+                    cache=cache,
+                )
+                for source in pending
+            ),
+            return_exceptions=True,
+        )
+        results.update(zip(pending, responses))
+
+    english: list[str] = []
+    chinese: list[str] = []
+    for source, source_items in grouped:
+        result = results[source]
+        sections = None
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            error = str(result) or type(result).__name__
+            print(
+                f"AI summary failed for {source}, falling back to extractive list: {error}",
+                file=sys.stderr,
+            )
+        else:
+            sections = _split_sections(result)
+            if sections is None:
+                print(
+                    f"AI summary for {source} is missing a language section, "
+                    "falling back to extractive list.",
+                    file=sys.stderr,
+                )
+        if sections is None:
+            fallback = _fallback_section(source, source_items)
+            sections = (fallback, fallback)
+        english.append(sections[0])
+        chinese.append(sections[1])
+
+    return (
+        f"{_ENGLISH_HEADER}\n" + "\n\n".join(english) + f"\n\n{_CHINESE_HEADER}\n" + "\n\n".join(chinese) + "\n"
+    )
+
+
+def summarize_items(items: list[Item], report_date: str) -> str:
+    return asyncio.run(_summarize_items_async(items, report_date))